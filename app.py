@@ -1,22 +1,91 @@
 import dash
-from dash import dcc, html, Input, Output, State
-import plotly.express as px
+from dash import dcc, html, Input, Output, State, ClientsideFunction
 import plotly.graph_objects as go
-import json
+import plotly.io as pio
+import fcntl
+import mmap
+import os
+import tempfile
+import orjson
+import ijson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut, GeocoderServiceError
-import pandas as pd
+from geopy.exc import GeocoderTimedOut, GeocoderServiceError, GeocoderRateLimited
+import numpy as np
+from shapely.geometry import shape, mapping
+from shapely.errors import GEOSException
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import namedtuple
+from contextlib import suppress
+from functools import lru_cache
 from dash.exceptions import PreventUpdate # Import PreventUpdate
+from flask import Response
+from flask_caching import Cache
 
-# Initialize Nominatim geolocator
-geolocator = Nominatim(user_agent="city_zip_explorer_app_v1.0")
-us_zip_geojson = None
+# Initialize Nominatim geolocator. geopy's default RequestsAdapter keeps one pooled keep-alive session
+# per geolocator, so lookups from this module-level instance reuse the TLS connection.
+geolocator = Nominatim(user_agent="city_zip_explorer_app_v1.0", timeout=5)
+# Time of the latest reserved Nominatim request slot, guarded by the lock, for the process-wide rate limit
+nominatim_lock = threading.Lock()
+nominatim_last_request = float("-inf")
+# Shared HTTP session so GeoJSON fetches reuse keep-alive connections instead of a new TLS handshake each time
+http_session = requests.Session()
+http_session.headers["Accept-Encoding"] = "gzip, deflate"
+# Retry dropped connections and transient GitHub errors with backoff; a 404 still fails fast so a missing
+# city file is cached as a miss
+http_session.mount("https://", HTTPAdapter(max_retries=Retry(
+    total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET",)
+)))
+# Worker threads for fetching candidate city GeoJSON URLs concurrently
+city_fetch_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="city-geojson")
+# Per-zip data as flat arrays: row i of every array describes codes[i], and that zip's single-feature
+# FeatureCollection JSON is features[offsets[i]:offsets[i + 1]]. centers ([lat, lon]) are int32 fixed-point
+# in units of 1 / COORDINATE_SCALE degrees. features is an mmap of the pack file, so
+# forked workers share its pages instead of each holding ~33k zips worth of Python dicts and lists.
+ZipPack = namedtuple("ZipPack", ["codes", "offsets", "centers", "features"])
+EMPTY_ZIP_PACK = ZipPack(np.empty(0, dtype="U5"), np.zeros(1, dtype=np.int64), np.empty((0, 2), dtype=np.int32), b"")
+# The pack is published in one assignment once fully built, so readers never need a lock
+zip_pack = None # ZipPack once loaded, EMPTY_ZIP_PACK if loading failed
+zip_geojson_ready = threading.Event() # Set once the background zip load has finished (successfully or not)
 
 # URLs for GeoJSON data
 ZIP_GEOJSON_URL = "https://raw.githubusercontent.com/ndrezn/zip-code-geojson/master/usa_zip_codes_geo_100m.json"
 CITY_GEOJSON_BASE_URL = "https://raw.githubusercontent.com/generalpiston/geojson-us-city-boundaries/master/cities/"
+ZIP_DOWNLOAD_TIMEOUT = 30 # Seconds before the streamed zip GeoJSON download is abandoned
+# (connect, read) seconds for a city GeoJSON fetch; it blocks a map callback, and each of the adapter's
+# retries gets the full timeout again, so it is kept short
+CITY_HTTP_TIMEOUT = (3.05, 10)
+
+# Local data directory for downloaded GeoJSON and cached figures
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+# Local copy of the zip GeoJSON so restarts skip the download
+ZIP_GEOJSON_CACHE_PATH = os.path.join(DATA_DIR, "usa_zip_codes_geo_100m.json")
+# Zip pack built from the GeoJSON: the per-zip arrays and the concatenated per-zip JSON they index into
+ZIP_PACK_INDEX_PATH = os.path.join(DATA_DIR, "usa_zip_codes_index.npz")
+ZIP_PACK_FEATURES_PATH = os.path.join(DATA_DIR, "usa_zip_codes_features.bin")
+# Held while downloading and building, so concurrent processes build the pack once
+ZIP_PACK_LOCK_PATH = os.path.join(DATA_DIR, "usa_zip_codes.lock")
+# Only these zip properties are used; the rest are dropped at load time
+ZIP_PROPERTIES_KEPT = ("ZCTA5CE10", "INTPTLAT10", "INTPTLON10")
+COORDINATE_DECIMALS = 5 # ~1 m precision, plenty for zip boundaries
+COORDINATE_SCALE = 10 ** 6 # Fixed-point scale for packed centers (~11 cm); +/-180 degrees fits in int32
+SIMPLIFY_TOLERANCE = 0.0005 # Degrees (~50 m); drops vertices the browser can't show at zip/city zoom levels
+CACHE_DIR = os.path.join(DATA_DIR, "cache")
+REDIS_URL = os.environ.get("REDIS_URL") # Optional; when set, the shared cache lives in Redis instead of CACHE_DIR
+FIGURE_CACHE_TIMEOUT = 3600 # Seconds a built map figure stays cached
+GEOCODE_CACHE_TIMEOUT = 30 * 24 * 3600 # Seconds a Nominatim result stays in the shared cache
+NOMINATIM_MIN_INTERVAL = 1.0 # Seconds between Nominatim requests; its usage policy allows at most 1 per second
+NOMINATIM_MAX_WAIT = 1.0 # Longest a suggestion lookup waits for its slot before it is dropped
+# Full zip (optionally ZIP+4) and partial 3-4 digit zip input, matched once per keystroke
+ZIP_CODE_RE = re.compile(r"^\s*(\d{5})(?:-\d{4})?\s*$")
+ZIP_PREFIX_RE = re.compile(r"^\s*(\d{3,4})\s*$")
+ZIP_SUGGESTION_LIMIT = 20 # Most zip codes suggested for a partial zip
+ZIP_GEOJSON_BROWSER_CACHE_SECONDS = 86400 # Zip boundaries are static, so let the browser keep them for a day
 
 STATE_ABBREVIATIONS = {
     "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas", "CA": "California",
@@ -28,46 +97,237 @@ STATE_ABBREVIATIONS = {
     "NM": "New Mexico", "NY": "New York", "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio",
     "OK": "Oklahoma", "OR": "Oregon", "PA": "Pennsylvania", "RI": "Rhode Island", "SC": "South Carolina",
     "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas", "UT": "Utah", "VT": "Vermont",
-    "VA": "Virginia", "WA": "Washington", "WV": "West Virginia", "WI": "Wisconsin", "WY": "Wyoming",
-    # Reverse mapping for easy lookup (full name to abbr)
-    "Alabama": "AL", "Alaska": "AK", "Arizona": "AZ", "Arkansas": "AR", "California": "CA",
-    "Colorado": "CO", "Connecticut": "CT", "Delaware": "DE", "Florida": "FL", "Georgia": "GA",
-    "Hawaii": "HI", "Idaho": "ID", "Illinois": "IL", "Indiana": "IN", "Iowa": "IA",
-    "Kansas": "KS", "Kentucky": "KY", "Louisiana": "LA", "Maine": "ME", "Maryland": "MD",
-    "Massachusetts": "MA", "Michigan": "MI", "Minnesota": "MN", "Mississippi": "MS", "Missouri": "MO",
-    "Montana": "MT", "Nebraska": "NE", "Nevada": "NV", "New Hampshire": "NH", "New Jersey": "NJ",
-    "New Mexico": "NM", "New York": "NY", "North Carolina": "NC", "North Dakota": "ND", "Ohio": "OH",
-    "Oklahoma": "OK", "Oregon": "OR", "Pennsylvania": "PA", "Rhode Island": "RI", "South Carolina": "SC",
-    "South Dakota": "SD", "Tennessee": "TN", "Texas": "TX", "Utah": "UT", "Vermont": "VT",
-    "Virginia": "VA", "Washington": "WA", "West Virginia": "WV", "Wisconsin": "WI", "Wyoming": "WY"
+    "VA": "Virginia", "WA": "Washington", "WV": "West Virginia", "WI": "Wisconsin", "WY": "Wyoming"
 }
+# Any state name or abbreviation -> two-letter abbreviation, so address parsing is one dict lookup per part
+STATE_ABBR_LOOKUP = {**{abbr: abbr for abbr in STATE_ABBREVIATIONS}, **{name: abbr for abbr, name in STATE_ABBREVIATIONS.items()}}
+CITY_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+# Function to create a uniquely named temp file next to a path, so concurrent writers never share one
+def make_temp_path(path):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    os.close(fd)
+    return tmp_path
+
+# Function to stream the features of the cached US Zip Code GeoJSON one at a time
+# ijson parses incrementally, so the full ~33k feature tree is never in memory at once
+def iter_zip_geojson_features():
+    with open(ZIP_GEOJSON_CACHE_PATH, "rb") as f:
+        yield from ijson.items(f, "features.item", use_float=True)
+
+# Function to download the US Zip Code GeoJSON straight into the disk cache
+# Streams in chunks so the 26 MB body is never held in memory alongside the parsed features
+def download_zip_geojson_cache():
+    with http_session.get(ZIP_GEOJSON_URL, stream=True, timeout=ZIP_DOWNLOAD_TIMEOUT) as response:
+        response.raise_for_status()
+        os.makedirs(os.path.dirname(ZIP_GEOJSON_CACHE_PATH), exist_ok=True)
+        tmp_path = make_temp_path(ZIP_GEOJSON_CACHE_PATH)
+        try:
+            with open(tmp_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=1 << 20):
+                    f.write(chunk)
+            os.replace(tmp_path, ZIP_GEOJSON_CACHE_PATH) # Atomic swap so a crash never leaves a half-written cache
+        finally:
+            with suppress(FileNotFoundError):
+                os.remove(tmp_path) # Only still there if the download failed
+    print(f"US Zip GeoJSON cached to: {ZIP_GEOJSON_CACHE_PATH}")
+
+# Function to simplify a Polygon/MultiPolygon feature's boundary in place and round its coordinates
+# Other geometry types are left untouched
+def simplify_feature_geometry(feature):
+    geometry = feature.get("geometry")
+    if not geometry or geometry["type"] not in ("Polygon", "MultiPolygon"):
+        return
+
+    def round_rings(polygon):
+        return [np.round(np.asarray(ring, dtype=np.float64)[:, :2], COORDINATE_DECIMALS).tolist() for ring in polygon]
+
+    # preserve_topology keeps rings valid and never collapses a small area to nothing
+    geometry = mapping(shape(geometry).simplify(SIMPLIFY_TOLERANCE, preserve_topology=True))
+    feature["geometry"] = geometry
+    if geometry["type"] == "Polygon":
+        geometry["coordinates"] = round_rings(geometry["coordinates"])
+    else:
+        geometry["coordinates"] = [round_rings(polygon) for polygon in geometry["coordinates"]]
+
+# Function to shrink a zip feature in place: drop unused properties, simplify the boundary and round coordinates
+def slim_zip_feature(feature):
+    properties = feature["properties"]
+    if properties.keys() - set(ZIP_PROPERTIES_KEPT): # Older caches already carry only the kept properties
+        feature["properties"] = {k: properties[k] for k in ZIP_PROPERTIES_KEPT if k in properties}
+    simplify_feature_geometry(feature)
+
+# Function to get the doubled signed area and area-weighted (lon, lat) centroid of a polygon ring
+def ring_area_centroid(ring):
+    points = np.asarray(ring, dtype=np.float64)[:, :2]
+    if not np.array_equal(points[0], points[-1]):
+        points = np.vstack([points, points[:1]]) # Close the ring so consecutive vertices pair up by slicing
+    origin = points[0]
+    # Work relative to the first vertex so the cross products don't lose precision at lon/lat magnitudes
+    x, y = points[:, 0] - origin[0], points[:, 1] - origin[1]
+    # Slices are views, so vertex pairs cost no extra copies
+    x, x_next, y, y_next = x[:-1], x[1:], y[:-1], y[1:]
+    f = x * y_next - x_next * y
+    double_area = f.sum()
+    if double_area == 0:
+        # Degenerate ring (no area), fall back to the vertex mean
+        center_lon, center_lat = points[:-1].mean(axis=0)
+        return 0.0, float(center_lon), float(center_lat)
+    # Scale once outside the sums instead of per vertex
+    scale = 1.0 / (3.0 * double_area)
+    center_lon = origin[0] + ((x + x_next) * f).sum() * scale
+    center_lat = origin[1] + ((y + y_next) * f).sum() * scale
+    return float(double_area), float(center_lon), float(center_lat)
+
+# Function to get the area-weighted (lon, lat) centroid of a polygon ring using the signed-area formula
+def ring_centroid(ring):
+    _, center_lon, center_lat = ring_area_centroid(ring)
+    return center_lon, center_lat
+
+# Function to get the (lat, lon) center of a zip feature, preferring the census internal point
+def get_feature_center(feature):
+    properties = feature["properties"]
+    if properties.get("INTPTLAT10") and properties.get("INTPTLON10"):
+        return float(properties["INTPTLAT10"]), float(properties["INTPTLON10"])
+    coords = feature["geometry"]["coordinates"]
+    if feature["geometry"]["type"] == "Polygon":
+        center_lon, center_lat = ring_centroid(coords[0])
+        return center_lat, center_lon
+    # MultiPolygon: weight each outer ring's centroid by its area so islands don't drag the center
+    centroids = np.array([ring_area_centroid(polygon[0]) for polygon in coords])
+    weights = np.abs(centroids[:, 0])
+    if weights.sum() == 0:
+        center_lon, center_lat = centroids[:, 1:].mean(axis=0)
+    else:
+        center_lon, center_lat = weights @ centroids[:, 1:] / weights.sum()
+    return float(center_lat), float(center_lon)
+
+# Function to find a zip code's row in the zip pack by binary search, or None
+def find_zip_row(zip_code):
+    codes = zip_pack.codes if zip_pack else EMPTY_ZIP_PACK.codes
+    row = int(np.searchsorted(codes, zip_code))
+    return row if row < len(codes) and codes[row] == zip_code else None
+
+# Function to get the single-feature FeatureCollection of a zip pack row as serialized JSON, straight from the mmap
+def get_zip_geojson_json(row):
+    return zip_pack.features[zip_pack.offsets[row]:zip_pack.offsets[row + 1]]
+
+# Function to list the first zip codes starting with a prefix, by binary search over the sorted zip codes
+def zip_codes_with_prefix(prefix, limit=ZIP_SUGGESTION_LIMIT):
+    codes = zip_pack.codes if zip_pack else EMPTY_ZIP_PACK.codes
+    start = int(np.searchsorted(codes, prefix))
+    # Matches are contiguous from start, so only the next `limit` codes can qualify
+    return [str(zip_code) for zip_code in codes[start:start + limit] if zip_code.startswith(prefix)]
+
+# Function to build the zip pack files from the zip GeoJSON features, slimming each feature on the way
+# Features can be any iterable; only their slim serialized form is kept until the rows are sorted
+def write_zip_pack(features):
+    rows = [] # (zip code, FeatureCollection JSON, [lat, lon])
+    for f in features:
+        try:
+            center = get_feature_center(f) # Before simplifying, so the center comes from the full boundary
+            slim_zip_feature(f)
+            zip_geojson = orjson.dumps({"type": "FeatureCollection", "features": [f]})
+            rows.append((f["properties"]["ZCTA5CE10"], zip_geojson, center))
+        except (KeyError, IndexError, TypeError, ValueError, GEOSException) as e:
+            # One malformed feature shouldn't cost every other zip its boundary
+            print(f"Skipping malformed US Zip feature: {e!r}")
+    rows.sort(key=lambda row: row[0])
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    centers = np.empty((len(rows), 2), dtype=np.int32)
+    features_tmp_path = make_temp_path(ZIP_PACK_FEATURES_PATH)
+    index_tmp_path = make_temp_path(ZIP_PACK_INDEX_PATH)
+    try:
+        with open(features_tmp_path, "wb") as out:
+            for i, (_, zip_geojson, center) in enumerate(rows):
+                out.write(zip_geojson)
+                offsets[i + 1] = offsets[i] + len(zip_geojson)
+                centers[i] = np.round(np.array(center) * COORDINATE_SCALE)
+        with open(index_tmp_path, "wb") as out:
+            codes = np.array([row[0] for row in rows], dtype="U5")
+            np.savez(out, codes=codes, offsets=offsets, centers=centers)
+        # The index is swapped in last, so a crash in between leaves no index and the pack is simply rebuilt
+        os.replace(features_tmp_path, ZIP_PACK_FEATURES_PATH)
+        os.replace(index_tmp_path, ZIP_PACK_INDEX_PATH)
+    finally:
+        for tmp_path in (features_tmp_path, index_tmp_path):
+            with suppress(FileNotFoundError):
+                os.remove(tmp_path) # Only still there if the build failed
+
+# Function to open the zip pack from disk (returns None if missing or unreadable)
+def read_zip_pack():
+    if not os.path.exists(ZIP_PACK_INDEX_PATH):
+        return None
+    try:
+        with np.load(ZIP_PACK_INDEX_PATH) as index, open(ZIP_PACK_FEATURES_PATH, "rb") as f:
+            if index["centers"].dtype != np.int32:
+                print(f"US Zip pack at {ZIP_PACK_INDEX_PATH} predates fixed-point coordinates, rebuilding")
+                return None
+            # Read-only shared mapping: pages come from the OS page cache and are shared by every worker
+            features = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return ZipPack(index["codes"], index["offsets"], index["centers"], features)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error reading US Zip pack at {ZIP_PACK_INDEX_PATH}: {e}")
+        return None
+
+# Function to build the zip pack under an exclusive lock on ZIP_PACK_LOCK_PATH, then open it
+# gunicorn workers and the debug reloader may all start a build at once; the first one to get the lock
+# builds and the rest block until it is done, then map its files. lockf locks belong to the process and
+# are not inherited across fork, so a worker forked while the master holds the lock waits on it too.
+def build_zip_pack():
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with open(ZIP_PACK_LOCK_PATH, "a") as lock_file:
+        fcntl.lockf(lock_file, fcntl.LOCK_EX) # Released when the file is closed
+        pack = read_zip_pack()
+        if pack is not None:
+            print(f"US Zip pack built by another process: {ZIP_PACK_INDEX_PATH}")
+            return pack
+        if os.path.exists(ZIP_GEOJSON_CACHE_PATH):
+            print(f"Building US Zip pack from cached GeoJSON: {ZIP_GEOJSON_CACHE_PATH}")
+        else:
+            print(f"Attempting to load US Zip GeoJSON from: {ZIP_GEOJSON_URL}")
+            download_zip_geojson_cache()
+        # Build the pack once; later restarts map it directly and never parse the GeoJSON again
+        write_zip_pack(iter_zip_geojson_features())
+        return read_zip_pack()
 
 # Function to load the US Zip Code GeoJSON data
 def load_zip_geojson():
-    global us_zip_geojson
-    if us_zip_geojson is None:
+    global zip_pack
+    if zip_pack is None:
         try:
-            print(f"Attempting to load US Zip GeoJSON from: {ZIP_GEOJSON_URL}")
-            response = requests.get(ZIP_GEOJSON_URL)
-            response.raise_for_status()
-            us_zip_geojson = json.loads(response.text)
+            pack = read_zip_pack()
+            if pack is not None:
+                print(f"US Zip pack loaded from cache: {ZIP_PACK_INDEX_PATH}")
+            else:
+                pack = build_zip_pack()
+            zip_pack = pack or EMPTY_ZIP_PACK
             print("US Zip GeoJSON loaded successfully.")
         except requests.exceptions.RequestException as e:
             print(f"Error loading US Zip GeoJSON: {e}")
-            us_zip_geojson = {"type": "FeatureCollection", "features": []}
-        except json.JSONDecodeError as e:
+            zip_pack = EMPTY_ZIP_PACK
+        except ijson.JSONError as e:
             print(f"Error decoding US Zip GeoJSON: {e}")
-            us_zip_geojson = {"type": "FeatureCollection", "features": []}
-    return us_zip_geojson
+            with suppress(FileNotFoundError):
+                os.remove(ZIP_GEOJSON_CACHE_PATH) # Unreadable copy, so the next start downloads a fresh one
+            zip_pack = EMPTY_ZIP_PACK
+        except OSError as e:
+            print(f"Error writing US Zip pack: {e}")
+            zip_pack = EMPTY_ZIP_PACK
+        except Exception as e:
+            print(f"An unexpected error occurred while loading US Zip GeoJSON: {e}")
+            zip_pack = EMPTY_ZIP_PACK
+    return zip_pack
 
 # Function to load a specific city's GeoJSON data
+# A missing file returns an empty FeatureCollection; other request errors are raised so callers can retry later
 def load_specific_city_geojson(state_abbr, city_slug):
     city_geojson_url = f"{CITY_GEOJSON_BASE_URL}{state_abbr.lower()}/{city_slug}.json"
     try:
         print(f"Attempting to load City GeoJSON for {city_slug.replace('_', ' ').title()} in {state_abbr.upper()} from: {city_geojson_url}")
-        response = requests.get(city_geojson_url)
+        response = http_session.get(city_geojson_url, timeout=CITY_HTTP_TIMEOUT)
         response.raise_for_status()
-        city_data = json.loads(response.text)
+        city_data = orjson.loads(response.content)
         print(f"City GeoJSON for {city_slug.replace('_', ' ').title()} loaded successfully.")
         return city_data
 
@@ -75,17 +335,116 @@ def load_specific_city_geojson(state_abbr, city_slug):
         print(f"HTTP Error loading city GeoJSON for {city_slug.replace('_', ' ').title()}: {e.response.status_code} - {e.response.reason}. URL: {city_geojson_url}")
         if e.response.status_code == 404:
             print(f"File not found for {city_slug.replace('_', ' ').title()} at {city_geojson_url}. It might not exist in the repository.")
-        return {"type": "FeatureCollection", "features": []}
+            return {"type": "FeatureCollection", "features": []}
+        raise
     except requests.exceptions.RequestException as e:
         print(f"Error loading City GeoJSON for {city_slug.replace('_', ' ').title()}: {e}")
-        return {"type": "FeatureCollection", "features": []}
-    except json.JSONDecodeError as e:
+        raise
+    except orjson.JSONDecodeError as e:
         print(f"Error decoding City GeoJSON for {city_slug.replace('_', ' ').title()}: {e}")
         return {"type": "FeatureCollection", "features": []}
 
+# Function to fetch a city's GeoJSON as serialized bytes, trying the slug with and without a "_city" suffix
+# concurrently so a miss on the first name costs the slower of the two requests rather than both in sequence.
+# Results, including "not found", are cached per (state, slug); request errors raise and are not cached.
+@lru_cache(maxsize=512)
+def fetch_city_geojson_json(state_abbr, city_slug):
+    if city_slug.endswith("_city"):
+        candidate_slugs = [city_slug, city_slug[:-len("_city")]]
+    else:
+        candidate_slugs = [city_slug, city_slug + "_city"]
+    futures = [city_fetch_executor.submit(load_specific_city_geojson, state_abbr, slug) for slug in candidate_slugs]
+    request_error = None
+    # Prefer the slug as geocoded, matching the old retry order
+    for future in futures:
+        try:
+            city_geojson_data = future.result()
+        except requests.exceptions.RequestException as e:
+            request_error = e
+            continue
+        if city_geojson_data["features"]:
+            # Simplify once before caching; city maps are drawn at zip-like zoom, so the dropped vertices never show
+            for f in city_geojson_data["features"]:
+                simplify_feature_geometry(f)
+            return orjson.dumps(city_geojson_data)
+    if request_error is not None:
+        raise request_error
+    return orjson.dumps({"type": "FeatureCollection", "features": []})
+
+# Function to load a city's GeoJSON; parses a fresh copy so callers can't modify the cached data
+def load_city_geojson(state_abbr, city_slug):
+    return orjson.loads(fetch_city_geojson_json(state_abbr, city_slug))
+
+
+# Shared map layout defaults, layered on Plotly's default template so every figure picks them up
+pio.templates["geo_app"] = go.layout.Template(layout=dict(
+    mapbox=dict(style="open-street-map"),
+    height=600,
+    width=800,
+    margin=dict(r=0, t=50, l=0, b=0)
+))
+pio.templates.default = "plotly+geo_app"
+
+# Function to build an empty map figure centered on a point; traces are added with go directly,
+# skipping the DataFrame and layout work Plotly Express does per figure
+def base_map_figure(center_lat, center_lon, zoom, title):
+    return go.Figure(layout=dict(title=title, mapbox=dict(center=dict(lat=center_lat, lon=center_lon), zoom=zoom)))
+
+# Function to build a map figure showing a single marker
+def point_map_figure(lat, lon, zoom, title, marker=None):
+    fig = base_map_figure(lat, lon, zoom, title)
+    fig.add_trace(go.Scattermapbox(lat=[lat], lon=[lon], mode="markers", marker=marker))
+    return fig
+
+# Initial map view, built once and reused whenever the selection is cleared
+DEFAULT_MAP_FIGURE = point_map_figure(39.8283, -98.5795, 3, "Enter a City or Zip Code to explore the map!")
+
+
+# compress=True gzips every response, including the zip GeoJSON routes, via flask-compress
+app = dash.Dash(__name__, compress=True)
+# Cache for built map figures and geocoder results, shared by every worker process and restart.
+# File-backed by default; with REDIS_URL set it is shared across hosts as well (needs the redis package).
+if REDIS_URL:
+    cache = Cache(app.server, config={"CACHE_TYPE": "RedisCache", "CACHE_REDIS_URL": REDIS_URL})
+else:
+    cache = Cache(app.server, config={"CACHE_TYPE": "FileSystemCache", "CACHE_DIR": CACHE_DIR})
+
+# Function to claim the next free Nominatim request slot and sleep until it comes up
+# Returns False without waiting when the slot is more than NOMINATIM_MAX_WAIT away
+def acquire_nominatim_slot():
+    global nominatim_last_request
+    with nominatim_lock:
+        now = time.monotonic()
+        slot = max(now, nominatim_last_request + NOMINATIM_MIN_INTERVAL)
+        if slot - now > NOMINATIM_MAX_WAIT:
+            return False
+        nominatim_last_request = slot # Reserved before sleeping, so concurrent callers queue behind it
+    time.sleep(slot - now)
+    return True
+
+# Function to geocode a search string, cached so repeated searches skip the Nominatim round-trip
+# In-process LRU in front of the shared cache; returns a tuple of (address, lat, lon)
+# Errors (including calls dropped by the rate limit) propagate and are not cached
+@lru_cache(maxsize=4096)
+def geocode_suggestions(query):
+    cache_key = f"geocode:{query}"
+    suggestions = cache.get(cache_key)
+    if suggestions is None:
+        if not acquire_nominatim_slot():
+            # Too many lookups queued ahead; raising keeps the miss out of both caches
+            raise GeocoderRateLimited("Nominatim rate limit reached, skipping suggestions")
+        # A lookup for the same query may have finished while this one waited for its slot
+        suggestions = cache.get(cache_key)
+        if suggestions is not None:
+            return suggestions
+        # Nominatim's geocode with exactly_one=False to get multiple results
+        # limit=3 to get top 3 results
+        locations = geolocator.geocode(query, exactly_one=False, limit=3)
+        suggestions = tuple((loc.address, loc.latitude, loc.longitude) for loc in locations or [])
+        cache.set(cache_key, suggestions, timeout=GEOCODE_CACHE_TIMEOUT)
+    return suggestions
+
 
-app = dash.Dash(__name__,
-                 external_scripts=["https://unpkg.com/@tailwindcss/browser@4"])
 app.layout = html.Div(
     className="min-h-screen bg-gray-100 p-4 font-inter antialiased flex flex-col items-center",
     children=[
@@ -114,6 +473,8 @@ app.layout = html.Div(
                                     searchable=True,
                                     optionHeight=50
                                 ),
+                                # Search text after the clientside debounce, which is what the autocomplete callback listens to
+                                dcc.Store(id="debounced-search-value"),
                             ]
                         ),
                     ]
@@ -125,7 +486,12 @@ app.layout = html.Div(
                     className="w-full lg:flex-1",
                     children=html.Div(
                         id="map-output",
-                        className="w-full h-[400px] lg:h-[600px] bg-gray-200 rounded-md overflow-hidden shadow-lg" # Adjusted height for smaller map
+                        className="w-full h-[400px] lg:h-[600px] bg-gray-200 rounded-md overflow-hidden shadow-lg", # Adjusted height for smaller map
+                        children=[
+                            html.Div(id="map-message"),
+                            # A single persistent graph; callbacks only swap its figure so the map is never re-mounted
+                            dcc.Graph(id="map-graph", figure=DEFAULT_MAP_FIGURE)
+                        ]
                     )
                 )
             ]
@@ -133,110 +499,101 @@ app.layout = html.Div(
     ]
 )
 
+# Handle typing in the browser (assets/search.js): zip prefixes are filtered there from /zip-codes.json,
+# everything else is debounced so only a settled search reaches the server
+app.clientside_callback(
+    ClientsideFunction(namespace="search", function_name="debounceSearchValue"),
+    Output("debounced-search-value", "data"),
+    Output("location-dropdown", "options", allow_duplicate=True),
+    Input("location-dropdown", "search_value"),
+    prevent_initial_call=True
+)
+
+
 # Callback to update dropdown options based on user input (autocomplete)
 @app.callback(
     Output("location-dropdown", "options"),
-    Input("location-dropdown", "search_value") 
+    Input("debounced-search-value", "data")
 )
 def update_dropdown_options(search_value):
     if not search_value or len(search_value) < 3:
         raise PreventUpdate
 
+    zip_match = ZIP_CODE_RE.match(search_value)
+    if zip_match:
+        # A full zip code is unambiguous, so answer directly and skip the geocoder round-trip
+        zip_code = zip_match.group(1)
+        if zip_geojson_ready.is_set() and find_zip_row(zip_code) is None:
+            return [{'label': f"Zip Code: {zip_code} (No boundary data)", 'value': orjson.dumps({'zip_code': zip_code}).decode()}]
+        return [{'label': f"Zip Code: {zip_code}", 'value': orjson.dumps({'zip_code': zip_code}).decode()}]
+
+    zip_prefix_match = ZIP_PREFIX_RE.match(search_value)
+    if zip_prefix_match:
+        # A partial zip is answered from the sorted zip codes alone; Nominatim has nothing useful for bare digits
+        zip_prefix = zip_prefix_match.group(1)
+        zip_codes = zip_codes_with_prefix(zip_prefix)
+        if not zip_codes and not zip_geojson_ready.is_set():
+            zip_codes = [zip_prefix] # Zip list not loaded yet, offer the prefix itself as before
+        if zip_codes:
+            return [{'label': f"Zip Code: {zip_code}", 'value': orjson.dumps({'zip_code': zip_code}).decode()} for zip_code in zip_codes]
+
     print(f"Searching for: {search_value}")
     options = []
     try:
-        # Nominatim's geocode with exactly_one=False to get multiple results
-        # limit=3 to get top 3 results
-        locations = geolocator.geocode(search_value, exactly_one=False, limit=3, timeout=5)
-        if locations:
-            for loc in locations:
-                options.append({'label': loc.address, 'value': json.dumps({'address': loc.address, 'lat': loc.latitude, 'lon': loc.longitude})})
+        # Nominatim ignores case and repeated spaces, so normalize the key to share cache entries
+        for address, lat, lon in geocode_suggestions(" ".join(search_value.split()).lower()):
+            options.append({'label': address, 'value': orjson.dumps({'address': address, 'lat': lat, 'lon': lon}).decode()})
+    except GeocoderRateLimited as e:
+        print(f"Geocoding skipped for suggestions: {e}")
+        raise PreventUpdate # Keep the current suggestions rather than blanking the dropdown
     except (GeocoderTimedOut, GeocoderServiceError) as e:
         print(f"Geocoding service error for suggestions: {e}")
     except Exception as e:
         print(f"An unexpected error occurred during suggestion search: {e}")
-
-        # Add zip code suggestion if it's a digit string
-        if search_value.isdigit() and len(search_value) >= 3 and len(search_value) <= 5:
-            if len(search_value) == 5:
-                if us_zip_geojson and any(f["properties"].get("ZCTA5CE10") == search_value for f in us_zip_geojson["features"]):
-                    options.insert(0, {'label': f"Zip Code: {search_value}", 'value': json.dumps({'zip_code': search_value})})
-                else:
-                    options.insert(0, {'label': f"Zip Code: {search_value} (No boundary data)", 'value': json.dumps({'zip_code': search_value})})
-            else: 
-                options.insert(0, {'label': f"Zip Code: {search_value}", 'value': json.dumps({'zip_code': search_value})})
     return options
 
 
 @app.callback(
-    Output("map-output", "children"),
+    Output("map-graph", "figure"),
+    Output("map-message", "children"),
     Input("location-dropdown", "value")
 )
 def update_map(selected_value_json):
     if not selected_value_json:
         # Initial map view or no input
-        return dcc.Graph(
-            figure=px.scatter_mapbox(
-                lat=[39.8283], lon=[-98.5795], zoom=3, height=600, width=800,
-                mapbox_style="open-street-map",
-                title="Enter a City or Zip Code to explore the map!"
-            ).update_layout(margin={"r":0,"t":50,"l":0,"b":0})
-        )
+        return DEFAULT_MAP_FIGURE, None
+
+    selected_data = orjson.loads(selected_value_json)
+    if 'zip_code' in selected_data:
+        # Zip codes are drawn by the clientside renderZipMap callback from /zip-geojson/<zip>.json
+        raise PreventUpdate
+
+    try:
+        # The cached figure is already serialized, so hand Dash the parsed dict instead of rebuilding it
+        return orjson.loads(build_map_figure_json(selected_value_json)), None
+    except requests.exceptions.RequestException:
+        # Boundary fetch failed (already logged); show the geocoded point, uncached so the next selection retries
+        return city_location_figure(selected_data['address'], selected_data['lat'], selected_data['lon']), None
+
+
+# Function to build the map figure for a geocoded city whose boundary is unavailable
+def city_location_figure(full_address, center_lat, center_lon, zoom=9):
+    return point_map_figure(
+        center_lat, center_lon, zoom,
+        f"Location for City: {full_address} (Boundary data not found or available)",
+        marker=dict(size=20, opacity=0.7, symbol="circle", color="red")
+    )
+
 
-    selected_data = json.loads(selected_value_json)
+# Function to build the map figure for a dropdown selection, memoized as serialized JSON per selection
+# City boundary request errors propagate, so a transient failure is never memoized
+@cache.memoize(timeout=FIGURE_CACHE_TIMEOUT)
+def build_map_figure_json(selected_value_json):
+    selected_data = orjson.loads(selected_value_json)
     fig = None
     
     center_lat, center_lon, zoom_level = 39.8283, -98.5795, 3 # Default US center
-    if 'zip_code' in selected_data:
-        location_input = selected_data['zip_code']
-        global us_zip_geojson
-        if us_zip_geojson is None:
-            load_zip_geojson()
-            if us_zip_geojson is None or not us_zip_geojson["features"]:
-                return html.Div("Error: Could not load US zip code data. Please try again later.", className="text-red-500 text-center mt-4")
-        filtered_features = [
-            f for f in us_zip_geojson["features"]
-            if f["properties"].get("ZCTA5CE10") == location_input
-        ]
-        if filtered_features:
-            filtered_geojson = {"type": "FeatureCollection", "features": filtered_features}
-            if filtered_features[0]["properties"].get("INTPTLAT10") and filtered_features[0]["properties"].get("INTPTLON10"):
-                center_lat = float(filtered_features[0]["properties"]["INTPTLAT10"])
-                center_lon = float(filtered_features[0]["properties"]["INTPTLON10"])
-                zoom_level = 10
-            else:
-                coords = filtered_features[0]["geometry"]["coordinates"]
-                if filtered_features[0]["geometry"]["type"] == "Polygon":
-                    lons = [c[0] for c in coords[0]]
-                    lats = [c[1] for c in coords[0]]
-                elif filtered_features[0]["geometry"]["type"] == "MultiPolygon":
-                    lons = [c[0] for c in coords[0][0]]
-                    lats = [c[1] for c in coords[0][0]]
-                center_lon = sum(lons) / len(lons)
-                center_lat = sum(lats) / len(lats)
-                zoom_level = 10
-
-            fig = px.choropleth_mapbox(
-                geojson=filtered_geojson,
-                locations=[location_input],
-                featureidkey="properties.ZCTA5CE10",
-                color_discrete_sequence=["blue"],
-                mapbox_style="open-street-map",
-                zoom=zoom_level,
-                center={"lat": center_lat, "lon": center_lon},
-                opacity=0.5,
-                height=600,
-                width=800,
-                title=f"Area for Zip Code: {location_input}"
-            )
-            fig.update_traces(marker_line_width=2, marker_line_color="black")
-        else:
-            fig = px.scatter_mapbox(
-                lat=[center_lat], lon=[center_lon], zoom=3, height=600,
-                mapbox_style="open-street-map",
-                title=f"Zip Code '{location_input}' not found or no boundary data available."
-            )
-    elif 'address' in selected_data:
+    if 'address' in selected_data:
         full_address = selected_data['address']
         center_lat = selected_data['lat']
         center_lon = selected_data['lon']
@@ -246,52 +603,30 @@ def update_map(selected_value_json):
         address_parts = full_address.split(', ')
         city_name_from_geocoded = address_parts[0].strip() # Get the first part as potential city name
 
-        state_abbr = None
-        for part in address_parts:
-            if part in STATE_ABBREVIATIONS:
-                state_abbr = STATE_ABBREVIATIONS[part]
-                break
-            elif len(part) == 2 and re.match(r'^[A-Z]{2}$', part):
-                if part in STATE_ABBREVIATIONS.values():
-                    state_abbr = part
-                    break
+        state_abbr = next((STATE_ABBR_LOOKUP[part] for part in address_parts if part in STATE_ABBR_LOOKUP), None)
         
         # Clean city name for slug creation
-        city_slug = re.sub(r'[^a-z0-9]+', '_', city_name_from_geocoded.lower()).strip('_')
+        city_slug = CITY_SLUG_RE.sub('_', city_name_from_geocoded.lower()).strip('_')
         
         city_geojson_data = {"type": "FeatureCollection", "features": []}
 
         if state_abbr:
-            city_geojson_data = load_specific_city_geojson(state_abbr.upper(), city_slug)
-            
-            if not city_geojson_data["features"] and not city_slug.endswith("_city"):
-                print(f"Retrying with '_city' suffix for {city_slug}")
-                city_geojson_data = load_specific_city_geojson(state_abbr.upper(), city_slug + "_city")
-            
-            if not city_geojson_data["features"] and city_slug.endswith("_city"):
-                print(f"Retrying by removing '_city' suffix for {city_slug}")
-                city_geojson_data = load_specific_city_geojson(state_abbr.upper(), city_slug[:-len("_city")])
+            city_geojson_data = load_city_geojson(state_abbr.upper(), city_slug)
 
         if city_geojson_data and city_geojson_data["features"]:
             feature_name_in_geojson = city_geojson_data["features"][0]["properties"].get("NAME", city_slug)
 
-            fig = px.choropleth_mapbox(
-                data_frame=pd.DataFrame({'city': [feature_name_in_geojson], 'value': [1]}),
+            fig = base_map_figure(center_lat, center_lon, 10, f"Boundary for City: {full_address}")
+            fig.add_trace(go.Choroplethmapbox(
                 geojson=city_geojson_data,
-                locations='city',
+                locations=[feature_name_in_geojson],
                 featureidkey="properties.NAME",
-                color='value',
-                color_discrete_sequence=["green"],
-                mapbox_style="open-street-map",
-                zoom=10,
-                center={"lat": center_lat, "lon": center_lon},
-                opacity=0.6,
-                height=600,
-                width=800,
-                title=f"Boundary for City: {full_address}"
-            )
-            fig.update_traces(marker_line_width=2, marker_line_color="black")
-            
+                z=[1],
+                colorscale=[[0, "green"], [1, "green"]], # Single solid fill, no color bar
+                showscale=False,
+                marker=dict(opacity=0.6, line=dict(width=2, color="black"))
+            ))
+
             fig.add_trace(go.Scattermapbox(
                 lat=[center_lat],
                 lon=[center_lon],
@@ -301,27 +636,75 @@ def update_map(selected_value_json):
             ))
 
         else:
-            fig = px.scatter_mapbox(
-                lat=[center_lat],
-                lon=[center_lon],
-                zoom=zoom_level,
-                mapbox_style="open-street-map",
-                height=600,
-                width=800,
-                title=f"Location for City: {full_address} (Boundary data not found or available)"
-            )
-            fig.update_traces(marker=dict(size=20, opacity=0.7, symbol="circle", color="red"))
+            fig = city_location_figure(full_address, center_lat, center_lon, zoom_level)
     else:
-        fig = px.scatter_mapbox(
-            lat=[center_lat], lon=[center_lon], zoom=3, height=600,
-            mapbox_style="open-street-map",
-            title="Please select a valid location from the dropdown."
-        )
+        fig = point_map_figure(center_lat, center_lon, 3, "Please select a valid location from the dropdown.")
+
+    return fig.to_json()
+
+
+# Zip code selections are rendered in the browser (assets/map.js), skipping the Python callback entirely
+app.clientside_callback(
+    ClientsideFunction(namespace="map", function_name="renderZipMap"),
+    Output("map-graph", "figure", allow_duplicate=True),
+    Output("map-message", "children", allow_duplicate=True),
+    Input("location-dropdown", "value"),
+    prevent_initial_call=True
+)
+
+
+# Route serving a single zip boundary and its center for the clientside zip renderer
+@app.server.route("/zip-geojson/<zip_code>.json")
+def serve_zip_geojson(zip_code):
+    if not zip_geojson_ready.is_set():
+        return Response(status=503) # Still loading in the background
+    if not zip_pack or not zip_pack.codes.size:
+        return Response(status=500) # Background load failed
+    row = find_zip_row(zip_code)
+    if row is None:
+        return Response(status=404)
+    center_lat, center_lon = zip_pack.centers[row] / COORDINATE_SCALE
+    # The feature JSON is spliced in as stored, so the boundary is never parsed or re-serialized per request
+    zip_geojson = get_zip_geojson_json(row)
+    center = orjson.dumps({"lat": float(center_lat), "lon": float(center_lon)})
+    response = Response(b'{"geojson":' + zip_geojson + b',"center":' + center + b"}", mimetype="application/json")
+    response.headers["Cache-Control"] = f"public, max-age={ZIP_GEOJSON_BROWSER_CACHE_SECONDS}"
+    return response
+
+
+# Route listing every zip code once, so the browser can suggest zip prefixes without calling the server
+@app.server.route("/zip-codes.json")
+def serve_zip_codes():
+    if not zip_geojson_ready.is_set():
+        return Response(status=503) # Still loading in the background
+    if not zip_pack or not zip_pack.codes.size:
+        return Response(status=500) # Background load failed
+    response = Response(orjson.dumps(zip_pack.codes.tolist()), mimetype="application/json")
+    response.headers["Cache-Control"] = f"public, max-age={ZIP_GEOJSON_BROWSER_CACHE_SECONDS}"
+    return response
+
+
+# Function to load the zip GeoJSON off the main thread so the server starts serving immediately
+def load_zip_geojson_in_background():
+    try:
+        load_zip_geojson()
+    finally:
+        zip_geojson_ready.set()
+
 
-    fig.update_layout(margin={"r":0,"t":50,"l":0,"b":0})
-    return dcc.Graph(figure=fig)
+# Function to resume an unfinished zip load in a forked worker, since the loading thread does not survive fork
+# The resumed load waits on the build lock, so it maps the master's pack rather than building a second one
+def resume_zip_load_after_fork():
+    global zip_geojson_ready
+    if not zip_geojson_ready.is_set():
+        zip_geojson_ready = threading.Event() # The parent's thread may have held the old event's lock at fork
+        threading.Thread(target=load_zip_geojson_in_background, daemon=True).start()
 
 
-load_zip_geojson()
+# WSGI entry point. Under `gunicorn -w 4 --preload app:server` the zip data is loaded once in the
+# master and shared with the workers copy-on-write; workers forked mid-load wait for the master's build.
+server = app.server
+os.register_at_fork(after_in_child=resume_zip_load_after_fork)
+threading.Thread(target=load_zip_geojson_in_background, daemon=True).start()
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
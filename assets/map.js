@@ -0,0 +1,82 @@
+// Clientside rendering for zip code selections. The zip boundary is fetched from
+// /zip-geojson/<zip>.json (browser-cached) and the Plotly figure is built here,
+// so zip lookups never run a Python callback.
+(function() {
+    var DEFAULT_CENTER = {lat: 39.8283, lon: -98.5795}; // Default US center
+    var LAYOUT_DEFAULTS = {
+        mapbox: {style: "open-street-map"},
+        height: 600,
+        width: 800,
+        margin: {r: 0, t: 50, l: 0, b: 0}
+    };
+
+    function message(text, className) {
+        return {namespace: "dash_html_components", type: "Div", props: {children: text, className: className}};
+    }
+
+    function layout(title, zoom, center) {
+        return Object.assign({}, LAYOUT_DEFAULTS, {
+            title: {text: title},
+            mapbox: Object.assign({}, LAYOUT_DEFAULTS.mapbox, {zoom: zoom, center: center})
+        });
+    }
+
+    function zipFigure(zipCode, data) {
+        return {
+            data: [{
+                type: "choroplethmapbox",
+                geojson: data.geojson,
+                locations: [zipCode],
+                featureidkey: "properties.ZCTA5CE10",
+                z: [1],
+                colorscale: [[0, "blue"], [1, "blue"]],
+                showscale: false,
+                marker: {opacity: 0.5, line: {width: 2, color: "black"}}
+            }],
+            layout: layout("Area for Zip Code: " + zipCode, 10, data.center)
+        };
+    }
+
+    function zipNotFoundFigure(zipCode) {
+        return {
+            data: [{type: "scattermapbox", lat: [DEFAULT_CENTER.lat], lon: [DEFAULT_CENTER.lon], mode: "markers"}],
+            layout: layout("Zip Code '" + zipCode + "' not found or no boundary data available.", 3, DEFAULT_CENTER)
+        };
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        map: {
+            renderZipMap: function(selectedValueJson) {
+                // Returns [map-graph figure, map-message children]
+                var noUpdate = window.dash_clientside.no_update;
+                if (!selectedValueJson) {
+                    return [noUpdate, noUpdate];
+                }
+                var selected = JSON.parse(selectedValueJson);
+                if (!("zip_code" in selected)) {
+                    return [noUpdate, noUpdate]; // Cities are rendered by the server callback
+                }
+                var zipCode = selected.zip_code;
+                var loadError = [noUpdate, message("Error: Could not load US zip code data. Please try again later.", "text-red-500 text-center mt-4")];
+                return fetch("/zip-geojson/" + encodeURIComponent(zipCode) + ".json")
+                    .then(function(response) {
+                        if (response.status === 404) {
+                            return [zipNotFoundFigure(zipCode), null];
+                        }
+                        if (response.status === 503) {
+                            return [noUpdate, message("Zip code boundary data is still loading. Please try again in a moment.", "text-gray-600 text-center mt-4")];
+                        }
+                        if (!response.ok) {
+                            return loadError;
+                        }
+                        return response.json().then(function(data) {
+                            return [zipFigure(zipCode, data), null];
+                        });
+                    })
+                    .catch(function() {
+                        return loadError;
+                    });
+            }
+        }
+    });
+})();
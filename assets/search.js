@@ -0,0 +1,74 @@
+// Clientside handling of the location search. Zip-code prefixes are answered
+// right here from the zip list served at /zip-codes.json, so digit-only
+// queries never reach the server. Any other text is debounced: each keystroke
+// schedules a forward of the search text and only the last keystroke in a
+// quiet window is passed on, so the server autocomplete (and Nominatim) runs
+// once per pause.
+(function() {
+    var SEARCH_DEBOUNCE_MS = 300;
+    var ZIP_SUGGESTION_LIMIT = 20;
+    var ZIP_QUERY_RE = /^\s*(\d{3,5})\s*$/;
+    var latestSearch = 0;
+    var zipCodesRequest = null;
+
+    // Fetch the sorted zip list once; a failed fetch (e.g. still loading) is retried on the next query
+    function zipCodes() {
+        if (!zipCodesRequest) {
+            zipCodesRequest = fetch("/zip-codes.json").then(function(response) {
+                if (!response.ok) {
+                    throw new Error("Zip list unavailable (" + response.status + ")");
+                }
+                return response.json();
+            });
+            zipCodesRequest.catch(function() {
+                zipCodesRequest = null;
+            });
+        }
+        return zipCodesRequest;
+    }
+
+    function zipOption(zipCode, label) {
+        return {label: label || "Zip Code: " + zipCode, value: JSON.stringify({zip_code: zipCode})};
+    }
+
+    function zipOptions(prefix, codes) {
+        var options = codes.filter(function(zipCode) {
+            return zipCode.startsWith(prefix);
+        }).slice(0, ZIP_SUGGESTION_LIMIT).map(function(zipCode) {
+            return zipOption(zipCode);
+        });
+        if (!options.length && prefix.length === 5) {
+            options.push(zipOption(prefix, "Zip Code: " + prefix + " (No boundary data)"));
+        }
+        return options;
+    }
+
+    function debounced(search, searchValue) {
+        return new Promise(function(resolve) {
+            setTimeout(function() {
+                // A newer keystroke arrived while waiting, so drop this one
+                var noUpdate = window.dash_clientside.no_update;
+                resolve([search === latestSearch ? searchValue : noUpdate, noUpdate]);
+            }, SEARCH_DEBOUNCE_MS);
+        });
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        search: {
+            debounceSearchValue: function(searchValue) {
+                var search = ++latestSearch;
+                var zipMatch = searchValue && ZIP_QUERY_RE.exec(searchValue);
+                if (!zipMatch) {
+                    return debounced(search, searchValue);
+                }
+                return zipCodes().then(function(codes) {
+                    var noUpdate = window.dash_clientside.no_update;
+                    return [noUpdate, search === latestSearch ? zipOptions(zipMatch[1], codes) : noUpdate];
+                }, function() {
+                    // No zip list in the browser yet, so let the server answer as before
+                    return debounced(search, searchValue);
+                });
+            }
+        }
+    });
+})();